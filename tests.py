@@ -7,6 +7,7 @@ import tempfile
 import unittest
 
 from virtualenvapi.manage import VirtualEnvironment
+from virtualenvapi.util import normalize_package_name, parse_requirement
 
 packages_for_tests = ['pep8']
 non_lowercase_packages_for_test = ['Pillow']
@@ -68,6 +69,49 @@ class InstalledTestCase(TestBase):
             self.virtual_env_obj.install(pack)
             self.assertTrue(self.virtual_env_obj.is_installed(pack))
 
+    def test_installed_specifier(self):
+        self.virtual_env_obj.install('pep8')
+        self.assertTrue(self.virtual_env_obj.is_installed('pep8>=1.0'))
+        self.assertTrue(self.virtual_env_obj.is_installed('PEP8[extra]>0'))
+        self.assertFalse(self.virtual_env_obj.is_installed('pep8<1.0'))
+        version = dict(self.virtual_env_obj.installed_packages)['pep8']
+        self.assertTrue(self.virtual_env_obj.is_installed(('pep8', version)))
+        self.assertFalse(self.virtual_env_obj.is_installed(('pep8', '0.0.1')))
+
+    def test_installed_normalized(self):
+        self.virtual_env_obj.install('typing_extensions')
+        self.assertIn('typing-extensions', self.virtual_env_obj.installed_package_names)
+        for name in ('typing_extensions', 'Typing-Extensions', 'typing.extensions',
+                     'https://github.com/python/typing_extensions.git'):
+            self.assertTrue(self.virtual_env_obj.is_installed(name))
+
+    def test_install_marker(self):
+        self.virtual_env_obj.install('pep8; python_version < "1"')
+        self.assertFalse(self.virtual_env_obj.is_installed('pep8'))
+        self.virtual_env_obj.uninstall('pep8; python_version < "1"')
+        self.virtual_env_obj.install('pep8; python_version >= "1"')
+        self.assertTrue(self.virtual_env_obj.is_installed('pep8'))
+        self.assertTrue(self.virtual_env_obj.is_installed('pep8; python_version < "1"'))
+        self.virtual_env_obj.uninstall('pep8; python_version < "1"')
+        self.assertTrue(self.virtual_env_obj.is_installed('pep8'))
+        self.virtual_env_obj.uninstall('pep8; python_version >= "1"')
+        self.assertFalse(self.virtual_env_obj.is_installed('pep8'))
+
+    def _make_local_package(self, name, version):
+        path = os.path.join(self.env_path, 'src', name)
+        os.makedirs(path)
+        with open(os.path.join(path, 'setup.py'), 'w') as fp:
+            fp.write('from setuptools import setup\nsetup(name=%r, version=%r)\n' % (name, version))
+        return path
+
+    def test_install_local(self):
+        self.virtual_env_obj.install('-e %s' % self._make_local_package('Foo_Bar', '0.1'))
+        self.virtual_env_obj.install(self._make_local_package('Baz', '0.2'))
+        self.assertIn('foo-bar', self.virtual_env_obj.installed_package_names)
+        self.assertTrue(self.virtual_env_obj.is_installed('foo_bar==0.1'))
+        self.assertTrue(self.virtual_env_obj.is_installed('baz==0.2'))
+        self.assertFalse(self.virtual_env_obj.is_installed('baz==0.1'))
+
     def test_install_requirements(self):
         """test installing Python packages from a pip requirements file"""
 
@@ -96,6 +140,26 @@ class InstalledTestCase(TestBase):
             self.assertTrue(self.virtual_env_obj.is_installed(pack))
 
 
+class RequirementTestCase(unittest.TestCase):
+    """
+    Test parsing of package names into requirements.
+    """
+
+    def test_normalize_package_name(self):
+        self.assertEqual(normalize_package_name('Foo.Bar_baz'), 'foo-bar-baz')
+
+    def test_parse_requirement(self):
+        req = parse_requirement('Django[bcrypt]>=2.0,<3; python_version >= "2.7"')
+        self.assertEqual(req.name, 'Django')
+        self.assertEqual(req.extras, set(['bcrypt']))
+        self.assertTrue(req.specifier.contains('2.2'))
+        self.assertFalse(req.specifier.contains('3.0'))
+        self.assertIs(parse_requirement('Django[bcrypt]>=2.0,<3; python_version >= "2.7"'), req)
+
+    def test_parse_invalid_requirement(self):
+        self.assertIsNone(parse_requirement('-e .'))
+
+
 class SearchTestCase(TestBase):
     """
     Test pip search.
@@ -1,12 +1,44 @@
 from os import linesep, environ
+import json
 import os.path
 import subprocess
 import six
 import sys
 
-from virtualenvapi.util import split_package_name, to_text, get_env_path, to_ascii
+from packaging.version import InvalidVersion
+
+from virtualenvapi.util import to_text, get_env_path, to_ascii, \
+        normalize_package_name, parse_requirement
 from virtualenvapi.exceptions import *
 
+# Prints the PEP 508 environment markers of the running interpreter as JSON,
+# using the same fields as packaging.markers.default_environment(). Only the
+# standard library is used so that it runs under any interpreter.
+_MARKER_ENVIRONMENT_SCRIPT = '''
+import json, os, platform, sys
+
+def format_full_version(info):
+    version = '%d.%d.%d' % (info.major, info.minor, info.micro)
+    if info.releaselevel != 'final':
+        version += info.releaselevel[0] + str(info.serial)
+    return version
+
+impl = getattr(sys, 'implementation', None)
+print(json.dumps({
+    'implementation_name': impl.name if impl else '',
+    'implementation_version': format_full_version(impl.version) if impl else '0',
+    'os_name': os.name,
+    'platform_machine': platform.machine(),
+    'platform_release': platform.release(),
+    'platform_system': platform.system(),
+    'platform_version': platform.version(),
+    'python_full_version': platform.python_version(),
+    'platform_python_implementation': platform.python_implementation(),
+    'python_version': '.'.join(platform.python_version_tuple()[:2]),
+    'sys_platform': sys.platform,
+}))
+'''
+
 
 class VirtualEnvironment(object):
 
@@ -72,6 +104,14 @@ class VirtualEnvironment(object):
             self._pip_version = tuple([int(n) for n in output.split('.')])
         return self._pip_version
 
+    @property
+    def _marker_environment(self):
+        """The environment markers (PEP 508) of this environment's interpreter."""
+        if not hasattr(self, '_marker_env'):
+            output = self._execute([self._python_rpath, '-c', _MARKER_ENVIRONMENT_SCRIPT], log=False)
+            self._marker_env = json.loads(output)
+        return self._marker_env
+
     @property
     def root(self):
         """The root directory that this virtual environment exists in."""
@@ -213,6 +253,9 @@ class VirtualEnvironment(object):
             package_args = package.split()
         else:
             package_args = [package]
+        if package_args[0] not in ('-e', '-r') and not self._markers_apply(package):
+            self._write_to_log('%s does not apply to this environment, skipping' % package)
+            return
         if not (force or upgrade) and (package_args[0] != '-r' and self.is_installed(package_args[-1])):
             self._write_to_log('%s is already installed, skipping (use force=True to override)' % package_args[-1])
             return
@@ -234,6 +277,9 @@ class VirtualEnvironment(object):
         ('name', 'ver')) from this virtual environment."""
         if isinstance(package, tuple):
             package = '=='.join(package)
+        if not self._markers_apply(package):
+            self._write_to_log('%s does not apply to this environment, skipping' % package)
+            return
         if not self.is_installed(package):
             self._write_to_log('%s is not installed, skipping' % package)
             return
@@ -270,18 +316,39 @@ class VirtualEnvironment(object):
 
     def is_installed(self, package):
         """Returns True if the given package (given in pip's package syntax or a
-        tuple of ('name', 'ver')) is installed in the virtual environment."""
+        tuple of ('name', 'ver')) is installed in the virtual environment.
+
+        Version specifiers (e.g. 'Django>=2.0,<3') are compared as per PEP 440
+        and names are PEP 503 normalized. Environment markers are ignored."""
         if isinstance(package, tuple):
             package = '=='.join(package)
+        installed = self._installed_index()
         if package.endswith('.git'):
             pkg_name = os.path.split(package)[1][:-4]
-            return pkg_name in self.installed_package_names or \
-                    pkg_name.replace('_', '-') in self.installed_package_names
-        pkg_tuple = split_package_name(package)
-        if pkg_tuple[1] is not None:
-            return pkg_tuple in self.installed_packages
-        else:
-            return pkg_tuple[0].lower() in self.installed_package_names
+            return normalize_package_name(pkg_name) in installed
+        req = parse_requirement(package)
+        if req is None:
+            return False
+        name = normalize_package_name(req.name)
+        if name not in installed:
+            return False
+        if not req.specifier:
+            return True
+        version = installed[name]
+        if version is None:
+            return False
+        try:
+            return req.specifier.contains(version, prereleases=True)
+        except InvalidVersion:
+            return False
+
+    def _markers_apply(self, package):
+        """Returns False if the given package has environment markers that do
+        not match this environment, in which case pip would ignore it."""
+        req = parse_requirement(package)
+        if req is None or req.marker is None:
+            return True
+        return req.marker.evaluate(self._marker_environment)
 
     def upgrade(self, package, force=False):
         """Shortcut method to upgrade a package. If `force` is set to True,
@@ -322,17 +389,43 @@ class VirtualEnvironment(object):
     def search_names(self, term):
         return list(self.search(term).keys())
 
+    @property
+    def _freeze_options(self):
+        """The arguments used to list installed packages with pip freeze."""
+        return ['-l', '--all'] if self.pip_version >= (8, 1, 0) else ['-l']
+
     @property
     def installed_packages(self):
         """
         List of all packages that are installed in this environment in
-        the format [(name, ver), ..].
+        the format [(name, ver), ..]. Names are PEP 503 normalized.
         """
-        freeze_options = ['-l', '--all'] if self.pip_version >= (8, 1, 0) else ['-l']
-        return list(map(split_package_name, filter(None, self._execute_pip(
-                ['freeze'] + freeze_options).split(linesep))))
+        # pip list reports the version of every distribution, including
+        # editable and direct URL installs that pip freeze lists without one
+        if self.pip_version >= (9, 0, 0):
+            return [(normalize_package_name(p['name']), p['version']) for p in json.loads(
+                    self._execute_pip(['list', '-l', '--format=json']))]
+        packages = []
+        for line in filter(None, self._execute_pip(['freeze'] + self._freeze_options).split(linesep)):
+            if line.startswith('-e ') and '#egg=' in line:
+                # editable installs are listed by their URL
+                line = line.split('#egg=', 1)[1].split('&', 1)[0]
+            req = parse_requirement(line)
+            if req is None:
+                continue
+            version = None
+            for spec in req.specifier:
+                if spec.operator in ('==', '==='):
+                    version = spec.version
+            packages.append((normalize_package_name(req.name), version))
+        return packages
 
     @property
     def installed_package_names(self):
         """List of all package names that are installed in this environment."""
-        return [name.lower() for name, _ in self.installed_packages]
+        return [name for name, _ in self.installed_packages]
+
+    def _installed_index(self):
+        """Dictionary of all packages that are installed in this environment,
+        mapping the normalized name to the installed version."""
+        return dict(self.installed_packages)
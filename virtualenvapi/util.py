@@ -2,6 +2,12 @@ from os import environ
 import six
 import sys
 
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
+
+# Parsed requirements keyed by the requirement string they were parsed from
+_requirement_cache = {}
+
 
 def to_text(source):
     if six.PY3:
@@ -37,10 +43,22 @@ def get_env_path():
     return path
 
 
-def split_package_name(p):
-    """Splits the given package name and returns a tuple (name, ver)."""
-    s = p.split(six.u('=='))
-    if len(s) == 1:
-        return (to_text(s[0]), None)
-    else:
-        return (to_text(s[0]), to_text(s[1]))
+def normalize_package_name(name):
+    """Returns the PEP 503 normalized form of the given package name."""
+    return canonicalize_name(to_text(name))
+
+
+def parse_requirement(p):
+    """Parses the given package name (in pip's package syntax) and returns a
+    `packaging.requirements.Requirement`, or None if it is not a valid
+    requirement (e.g. a path or URL). Results are cached per string."""
+    try:
+        return _requirement_cache[p]
+    except KeyError:
+        pass
+    try:
+        req = Requirement(to_text(p).strip())
+    except InvalidRequirement:
+        req = None
+    _requirement_cache[p] = req
+    return req